@@ -8,6 +8,7 @@ from schema_extractor import SchemaExtractor
 from sql_validator import SQLValidator
 from sql_agent import SQLAgent
 from db_executor import DBExecutor
+from batch_runner import BatchRunner
 
 st.set_page_config(
     page_title="SQL Agent - Natural Language to SQL",
@@ -62,6 +63,8 @@ def init_session_state():
         st.session_state.loaded_files = []    
     if 'query_history' not in st.session_state:
         st.session_state.query_history = []
+    if 'batch_result' not in st.session_state:
+        st.session_state.batch_result = None
 
 def load_uploaded_file(uploaded_file) -> tuple:
     try:
@@ -143,6 +146,58 @@ def process_natural_language_query(question: str, api_key: Optional[str] = None,
             'message': f'Unexpected error: {str(e)}'
         }
 
+def process_batch_questions(questions: list, api_key: Optional[str] = None, model: str = "llama-3.3-70b-versatile", max_workers: int = 4) -> dict:
+    try:
+        if not st.session_state.schema:
+            return {'results': [], 'success': False, 'message': 'No database loaded. Please upload a dataset first.'}
+        if not api_key:
+            return {'results': [], 'success': False, 'message': 'Groq API key required'}
+        conn = st.session_state.data_loader.get_connection()
+        extractor = SchemaExtractor(conn)
+        schema_text = extractor.format_schema_for_prompt(st.session_state.schema)
+        try:
+            agent = SQLAgent(api_key=api_key, model=model)
+        except Exception as e:
+            return {'results': [], 'success': False, 'message': f'Groq API Error: {str(e)}'}
+        runner = BatchRunner(conn, agent, max_workers=max_workers)
+        with st.spinner(f"Generating and running {len(questions)} queries..."):
+            results = runner.run(questions, schema_text)
+        succeeded = sum(1 for r in results if r['success'])
+        return {
+            'results': results,
+            'summary': runner.summarize(results),
+            'exports': {},
+            'export_errors': {},
+            'success': True,
+            'message': f"{succeeded} of {len(results)} question(s) answered successfully."
+        }
+    except Exception as e:
+        return {'results': [], 'success': False, 'message': f'Unexpected error: {str(e)}'}
+
+def build_batch_export(batch: dict, export_name: str):
+    runner = BatchRunner(st.session_state.data_loader.get_connection(), agent=None)
+    builders = {'workbook': runner.to_excel_bytes, 'parquet_bundle': runner.to_parquet_zip_bytes}
+    try:
+        batch['exports'][export_name] = builders[export_name](batch['results'])
+    except Exception as e:
+        batch['export_errors'][export_name] = str(e)
+
+def render_batch_export(batch: dict, export_name: str, label: str, file_name: str, mime: str):
+    if export_name in batch['exports']:
+        st.download_button(
+            label=f"Download {label}",
+            data=batch['exports'][export_name],
+            file_name=file_name,
+            mime=mime,
+            use_container_width=True
+        )
+    elif export_name in batch['export_errors']:
+        st.warning(f"{label} export failed: {batch['export_errors'][export_name]}")
+    elif st.button(f"Prepare {label}", use_container_width=True):
+        with st.spinner(f"Preparing {label}..."):
+            build_batch_export(batch, export_name)
+        st.rerun()
+
 def main():
     init_session_state()
     st.markdown('<div class="main-header">SQL Agent</div>', unsafe_allow_html=True)
@@ -204,6 +259,12 @@ def main():
                     st.text(f"{idx}. {file} → {table_name}")
                     if row_count is not None:
                         st.caption(f"   {row_count} rows")
+                    report = st.session_state.data_loader.get_optimization_report(table_name)
+                    if report and report['conversions']:
+                        with st.expander(f"Type optimization: {report['percent_saved']:.1f}% smaller"):
+                            st.caption(f"{report['original_bytes']:,} → {report['optimized_bytes']:,} bytes ({report['bytes_saved']:,} saved)")
+                            for col, change in report['conversions'].items():
+                                st.text(f"{col}: {change}")
                 else:
                     st.text(f"{idx}. {file}")        
         st.divider()
@@ -213,6 +274,7 @@ def main():
             st.session_state.schema = {}
             st.session_state.loaded_files = []
             st.session_state.query_history = []
+            st.session_state.batch_result = None
             st.success("All data cleared!")
             st.rerun()
     col1, col2 = st.columns([1, 1])    
@@ -240,6 +302,14 @@ def main():
         with col_b:
             if st.button("History", use_container_width=True):
                 st.session_state.show_history = not st.session_state.get('show_history', False)    
+        with st.expander("Batch Questions"):
+            question_file = st.file_uploader(
+                "Question file",
+                type=['txt', 'csv'],
+                help="One question per line (.txt), or a CSV with one question per row (an optional 'question' header selects the column)"
+            )
+            max_workers = st.slider("Parallel LLM requests", min_value=1, max_value=8, value=4)
+            run_batch = st.button("Run Batch", use_container_width=True, disabled=question_file is None)
     if execute_query:
         if not question.strip():
             st.warning("Please enter a question")
@@ -277,6 +347,56 @@ def main():
                     st.info("No rows returned by the query")
             else:
                 st.error(result['message'])
+    if run_batch:
+        if not st.session_state.schema:
+            st.error("Please upload a dataset first")
+        else:
+            try:
+                questions = BatchRunner.parse_questions(question_file.getvalue(), question_file.name)
+            except Exception as e:
+                questions = []
+                st.error(f"Error reading question file: {str(e)}")
+            if questions:
+                selected_model = model if api_key and 'model' in locals() else "llama-3.3-70b-versatile"
+                batch = process_batch_questions(
+                    questions,
+                    api_key=api_key if api_key else None,
+                    model=selected_model,
+                    max_workers=max_workers
+                )
+                for r in batch['results']:
+                    st.session_state.query_history.append({
+                        'question': r['question'],
+                        'sql': r['sql'],
+                        'success': r['success']
+                    })
+                st.session_state.batch_result = batch
+            elif question_file is not None:
+                st.warning("No questions found in the uploaded file")
+    batch = st.session_state.batch_result
+    if batch:
+        st.divider()
+        st.header("Batch Results")
+        if batch['success']:
+            st.success(batch['message'])
+            st.dataframe(batch['summary'], use_container_width=True)
+            col_x, col_y = st.columns(2)
+            with col_x:
+                render_batch_export(
+                    batch, 'workbook', "Workbook (.xlsx)", "batch_results.xlsx",
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+            with col_y:
+                render_batch_export(batch, 'parquet_bundle', "Parquet Bundle (.zip)", "batch_results.zip", "application/zip")
+            for r in batch['results']:
+                with st.expander(f"Q{r['index']}: {r['question'][:60]}"):
+                    st.code(r['sql'], language='sql')
+                    if r['success']:
+                        st.dataframe(r['result'], use_container_width=True)
+                    else:
+                        st.error(r['message'])
+        else:
+            st.error(batch['message'])
     if st.session_state.get('show_history', False) and st.session_state.query_history:
         st.divider()
         st.header("Query History")
@@ -0,0 +1,194 @@
+import csv
+import io
+import os
+import re
+import tempfile
+import time
+import zipfile
+import duckdb
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any
+
+from sql_validator import SQLValidator
+from db_executor import DBExecutor
+
+
+class BatchRunner:
+    QUESTION_COLUMNS = ['question', 'questions', 'query', 'prompt']
+    MAX_QUESTIONS = 200
+    # One row of every worksheet is taken by the header.
+    EXCEL_MAX_ROWS = 1048575
+    EXCEL_ILLEGAL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+    def __init__(self, conn: duckdb.DuckDBPyConnection, agent, max_workers: int = 4):
+        self.conn = conn
+        self.agent = agent
+        self.max_workers = max(1, max_workers)
+        self.validator = SQLValidator()
+        self.executor = DBExecutor(conn)
+
+    @classmethod
+    def parse_questions(cls, content: bytes, file_name: str) -> List[str]:
+        file_extension = os.path.splitext(file_name)[1].lower()
+        if file_extension == '.csv':
+            lines = cls._parse_question_csv(content.decode('utf-8-sig'))
+        elif file_extension == '.txt':
+            lines = content.decode('utf-8-sig').splitlines()
+        else:
+            raise ValueError(f"Unsupported question file format: {file_extension}")
+        questions = [line.strip() for line in lines if line.strip()]
+        if len(questions) > cls.MAX_QUESTIONS:
+            raise ValueError(f"Too many questions ({len(questions)}). The limit is {cls.MAX_QUESTIONS} per batch.")
+        return questions
+
+    @classmethod
+    def _parse_question_csv(cls, text: str) -> List[str]:
+        rows = [row for row in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in row)]
+        if not rows:
+            return []
+        header = [cell.strip().lower() for cell in rows[0]]
+        column = next((idx for idx, name in enumerate(header) if name in cls.QUESTION_COLUMNS), None)
+        if column is not None:
+            return [row[column] for row in rows[1:] if column < len(row)]
+        if all(len(row) == 1 for row in rows):
+            return [row[0] for row in rows]
+        # Without a known header, a file whose rows all have the same number of
+        # fields is a table we cannot interpret; otherwise treat each line as a
+        # question that happens to contain commas.
+        if len(rows) > 1 and len({len(row) for row in rows}) == 1:
+            raise ValueError(
+                f"Could not find a question column. Add a header named one of: {', '.join(cls.QUESTION_COLUMNS)}."
+            )
+        return text.splitlines()
+
+    def run(self, questions: List[str], schema_text: str) -> List[Dict[str, Any]]:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            generated = list(pool.map(lambda q: self._generate(q, schema_text), questions))
+        results = []
+        executed: Dict[str, int] = {}
+        for idx, (question, (sql, generation_time, error)) in enumerate(zip(questions, generated), 1):
+            entry = {
+                'index': idx,
+                'question': question,
+                'sql': sql,
+                'result': pd.DataFrame(),
+                'success': False,
+                'message': error,
+                'generation_time': generation_time,
+                'execution_time': 0.0,
+                'duplicate_of': None
+            }
+            results.append(entry)
+            if error:
+                continue
+            if sql in executed:
+                original = results[executed[sql]]
+                entry.update({
+                    'result': original['result'],
+                    'success': original['success'],
+                    'message': original['message'],
+                    'duplicate_of': original['index']
+                })
+                continue
+            start = time.perf_counter()
+            success, df, exec_message = self.executor.execute_query(sql)
+            entry.update({
+                'result': df if df is not None else pd.DataFrame(),
+                'success': success,
+                'message': exec_message,
+                'execution_time': time.perf_counter() - start
+            })
+            executed[sql] = idx - 1
+        return results
+
+    def _generate(self, question: str, schema_text: str) -> Tuple[str, float, str]:
+        start = time.perf_counter()
+        try:
+            sql = self.agent.generate_sql(question, schema_text)
+        except Exception as e:
+            return '', time.perf_counter() - start, str(e)
+        elapsed = time.perf_counter() - start
+        if sql.startswith("ERROR:"):
+            return sql, elapsed, sql
+        is_valid, error_msg = self.validator.validate(sql)
+        if not is_valid:
+            return sql, elapsed, f'SQL Validation Failed: {error_msg}'
+        return self.validator.sanitize_sql(sql), elapsed, ''
+
+    @staticmethod
+    def summarize(results: List[Dict[str, Any]]) -> pd.DataFrame:
+        summary = pd.DataFrame([
+            {
+                'index': r['index'],
+                'question': r['question'],
+                'sql': r['sql'],
+                'success': r['success'],
+                'rows': len(r['result']),
+                'duplicate_of': r['duplicate_of'],
+                'generation_seconds': round(r['generation_time'], 3),
+                'execution_seconds': round(r['execution_time'], 3),
+                'message': r['message']
+            }
+            for r in results
+        ])
+        if not summary.empty:
+            summary['duplicate_of'] = summary['duplicate_of'].astype('Int64')
+        return summary
+
+    @classmethod
+    def to_excel_bytes(cls, results: List[Dict[str, Any]]) -> bytes:
+        buffer = io.BytesIO()
+        notes: Dict[int, str] = {}
+        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+            for r in results:
+                if not r['success'] or r['result'].empty:
+                    continue
+                sheet_name = cls._result_name(r)[:31]
+                df = cls._prepare_excel_frame(r['result'])
+                if len(df) > cls.EXCEL_MAX_ROWS:
+                    df = df.head(cls.EXCEL_MAX_ROWS)
+                    notes[r['index']] = f"Truncated to {cls.EXCEL_MAX_ROWS:,} of {len(r['result']):,} rows"
+                try:
+                    df.to_excel(writer, sheet_name=sheet_name, index=False)
+                except Exception as e:
+                    if sheet_name in writer.book.sheetnames:
+                        del writer.book[sheet_name]
+                    notes[r['index']] = f"Sheet skipped: {str(e)}"
+            summary = cls.summarize(results)
+            summary['export_note'] = [notes.get(r['index'], '') for r in results]
+            cls._prepare_excel_frame(summary).to_excel(writer, sheet_name='summary', index=False)
+            writer.book.move_sheet('summary', offset=-(len(writer.book.sheetnames) - 1))
+        return buffer.getvalue()
+
+    @classmethod
+    def _prepare_excel_frame(cls, df: pd.DataFrame) -> pd.DataFrame:
+        df = df.copy()
+        for col in df.columns:
+            if isinstance(df[col].dtype, pd.DatetimeTZDtype):
+                df[col] = df[col].dt.tz_localize(None)
+            elif pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+                df[col] = df[col].map(lambda v: cls.EXCEL_ILLEGAL_CHARS.sub('', v) if isinstance(v, str) else v)
+        df.columns = [cls.EXCEL_ILLEGAL_CHARS.sub('', str(col)) for col in df.columns]
+        return df
+
+    def to_parquet_zip_bytes(self, results: List[Dict[str, Any]]) -> bytes:
+        buffer = io.BytesIO()
+        with tempfile.TemporaryDirectory() as temp_dir, zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            frames = [('summary', self.summarize(results))]
+            frames += [(self._result_name(r), r['result']) for r in results if r['success'] and not r['result'].empty]
+            for name, df in frames:
+                path = os.path.join(temp_dir, f"{name}.parquet")
+                cursor = self.conn.cursor()
+                try:
+                    cursor.register('batch_export', df)
+                    cursor.execute(f"COPY batch_export TO '{path}' (FORMAT PARQUET)")
+                finally:
+                    cursor.close()
+                archive.write(path, f"{name}.parquet")
+        return buffer.getvalue()
+
+    @staticmethod
+    def _result_name(result: Dict[str, Any]) -> str:
+        slug = re.sub(r'[^a-z0-9]+', '_', result['question'].lower()).strip('_')[:20]
+        return f"q{result['index']:03d}_{slug}".rstrip('_')
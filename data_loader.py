@@ -1,12 +1,26 @@
 import duckdb
 import pandas as pd
 import os
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Any
 
 class DataLoader:  
-    def __init__(self, db_path: str = ":memory:"):
+    CATEGORY_MAX_UNIQUE = 50
+    CATEGORY_MAX_RATIO = 0.5
+    DATE_REGEX = r'\d{4}[-/]\d{1,2}[-/]\d{1,2}'
+    TIMESTAMP_REGEX = DATE_REGEX + r'[ T]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?'
+    # Estimated in-memory widths; strings are a 16-byte header plus the
+    # payload when it is too long to be inlined.
+    TYPE_WIDTHS = {
+        'BOOLEAN': 1, 'TINYINT': 1, 'SMALLINT': 2, 'INTEGER': 4, 'BIGINT': 8, 'HUGEINT': 16,
+        'FLOAT': 4, 'DOUBLE': 8, 'DATE': 4, 'TIMESTAMP': 8
+    }
+    STRING_HEADER_BYTES = 16
+    STRING_INLINE_MAX = 12
+    def __init__(self, db_path: str = ":memory:", optimize_types: bool = True):
         self.conn = duckdb.connect(db_path)
-        self.loaded_tables: List[str] = []    
+        self.loaded_tables: List[str] = []
+        self.optimize_types = optimize_types
+        self.optimization_reports: Dict[str, Dict[str, Any]] = {}    
     def load_csv(self, file_path: str, table_name: Optional[str] = None) -> Tuple[str, bool, str]:
         try:
             if table_name is None:
@@ -15,9 +29,9 @@ class DataLoader:
             if df.empty:
                 return table_name, False, "CSV file is empty"
             df.columns = [self._clean_column_name(col) for col in df.columns]            
-            self.conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM df")
+            self._create_table(table_name, df)
             self.loaded_tables.append(table_name)            
-            return table_name, True, f"Successfully loaded {len(df)} rows into table '{table_name}'"
+            return table_name, True, f"Successfully loaded {len(df)} rows into table '{table_name}'{self._format_savings(table_name)}"
         except Exception as e:
             return table_name or "unknown", False, f"Error loading CSV: {str(e)}"    
     def load_excel(self, file_path: str, table_name: Optional[str] = None, sheet_name: int = 0) -> Tuple[str, bool, str]:
@@ -28,9 +42,9 @@ class DataLoader:
             if df.empty:
                 return table_name, False, "Excel file is empty"            
             df.columns = [self._clean_column_name(col) for col in df.columns]            
-            self.conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM df")
+            self._create_table(table_name, df)
             self.loaded_tables.append(table_name)            
-            return table_name, True, f"Successfully loaded {len(df)} rows into table '{table_name}'"            
+            return table_name, True, f"Successfully loaded {len(df)} rows into table '{table_name}'{self._format_savings(table_name)}"            
         except Exception as e:
             return table_name or "unknown", False, f"Error loading Excel: {str(e)}"    
     def load_sqlite(self, file_path: str) -> Tuple[List[str], bool, str]:
@@ -46,6 +60,8 @@ class DataLoader:
                 if table_name.startswith('sqlite_'):
                     continue
                 self.conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM sqlite_db.{table_name}")
+                if self.optimize_types:
+                    self._optimize_table(table_name)
                 loaded_tables.append(table_name)
                 self.loaded_tables.append(table_name)            
             self.conn.execute("DETACH sqlite_db")            
@@ -82,6 +98,93 @@ class DataLoader:
         return self.conn    
     def get_loaded_tables(self) -> List[str]:
         return self.loaded_tables.copy()    
+    def get_optimization_report(self, table_name: str) -> Optional[Dict[str, Any]]:
+        return self.optimization_reports.get(table_name)    
+    def _create_table(self, table_name: str, df: pd.DataFrame):
+        self.conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM df")
+        if self.optimize_types:
+            self._optimize_table(table_name)    
+    def _format_savings(self, table_name: str) -> str:
+        report = self.optimization_reports.get(table_name)
+        if not report or report['bytes_saved'] <= 0:
+            return ""
+        return f" (type optimization saved {self._format_bytes(report['bytes_saved'])}, {report['percent_saved']:.1f}%)"    
+    def _optimize_table(self, table_name: str):
+        columns = self.conn.execute(f"DESCRIBE {table_name}").fetchall()
+        row_count = self.conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+        select_list = []
+        conversions: Dict[str, str] = {}
+        original_bytes = 0
+        optimized_bytes = 0
+        for col_name, col_type, *_ in columns:
+            quoted = self._quote_identifier(col_name)
+            try:
+                target, label, before, after = self._plan_column(table_name, quoted, col_type, row_count)
+            except Exception:
+                target, label = None, None
+                before = after = self._column_bytes(col_type, row_count)
+            original_bytes += before
+            if target:
+                select_list.append(f"CAST({quoted} AS {target}) AS {quoted}")
+                conversions[col_name] = f"{col_type} -> {label}"
+                optimized_bytes += after
+            else:
+                select_list.append(quoted)
+                optimized_bytes += before
+        if conversions:
+            try:
+                self.conn.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT {', '.join(select_list)} FROM {table_name}")
+            except Exception:
+                conversions = {}
+                optimized_bytes = original_bytes
+        bytes_saved = original_bytes - optimized_bytes
+        self.optimization_reports[table_name] = {
+            'rows': row_count,
+            'original_bytes': original_bytes,
+            'optimized_bytes': optimized_bytes,
+            'bytes_saved': bytes_saved,
+            'percent_saved': (bytes_saved / original_bytes * 100) if original_bytes else 0.0,
+            'conversions': conversions
+        }    
+    def _plan_column(self, table_name: str, quoted: str, col_type: str, row_count: int) -> Tuple[Optional[str], Optional[str], int, int]:
+        unchanged = self._column_bytes(col_type, row_count)
+        # Numeric columns keep their width: DuckDB raises on integer overflow
+        # instead of widening, so narrowing would break ordinary arithmetic.
+        if col_type == 'VARCHAR':
+            non_null, distinct, overflow_bytes, dates, timestamps = self.conn.execute(f"""
+                SELECT COUNT({quoted}),
+                       COUNT(DISTINCT {quoted}),
+                       COALESCE(SUM(CASE WHEN strlen({quoted}) > {self.STRING_INLINE_MAX} THEN strlen({quoted}) ELSE 0 END), 0),
+                       COUNT(*) FILTER (WHERE regexp_full_match({quoted}, ?) AND TRY_CAST({quoted} AS DATE) IS NOT NULL),
+                       COUNT(*) FILTER (WHERE regexp_full_match({quoted}, ?) AND TRY_CAST({quoted} AS TIMESTAMP) IS NOT NULL)
+                FROM {table_name}
+            """, [self.DATE_REGEX, self.TIMESTAMP_REGEX]).fetchone()
+            before = self.STRING_HEADER_BYTES * row_count + int(overflow_bytes)
+            if non_null and dates == non_null:
+                return 'DATE', 'DATE', before, 4 * row_count
+            if non_null and dates + timestamps == non_null:
+                return 'TIMESTAMP', 'TIMESTAMP', before, 8 * row_count
+            if non_null and distinct <= self.CATEGORY_MAX_UNIQUE and distinct <= row_count * self.CATEGORY_MAX_RATIO:
+                values = [v for (v,) in self.conn.execute(
+                    f"SELECT DISTINCT {quoted} FROM {table_name} WHERE {quoted} IS NOT NULL ORDER BY 1"
+                ).fetchall()]
+                enum_type = "ENUM(" + ", ".join("'" + v.replace("'", "''") + "'" for v in values) + ")"
+                return enum_type, 'ENUM', before, row_count + sum(len(v.encode('utf-8')) for v in values)
+            return None, None, before, before
+        return None, None, unchanged, unchanged    
+    def _column_bytes(self, col_type: str, row_count: int) -> int:
+        return self.TYPE_WIDTHS.get(col_type, 8) * row_count    
+    @staticmethod
+    def _quote_identifier(name: str) -> str:
+        return '"' + str(name).replace('"', '""') + '"'    
+    @staticmethod
+    def _format_bytes(num_bytes: int) -> str:
+        size = float(num_bytes)
+        for unit in ['B', 'KB', 'MB']:
+            if abs(size) < 1024:
+                return f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"    
     def close(self):
         if self.conn:
             self.conn.close()    
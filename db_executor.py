@@ -18,6 +18,7 @@ class DBExecutor:
             return True, df, f"Query executed successfully. Returned {row_count} row(s) with {col_count} column(s)."            
         except Exception as e:
             error_msg = self._format_error_message(str(e))
+            return False, None, error_msg
 
     def _format_error_message(self, error: str) -> str:
         error_lower = error.lower()        
@@ -26,8 +26,10 @@ class SchemaExtractor:
                 AND table_schema = 'main'
                 ORDER BY ordinal_position
             """).fetchall()            
+            # ENUM types spell out their values; report them as plain text so
+            # cell values never reach the LLM prompt.
             columns = [
-                {'name': col_name, 'type': data_type}
+                {'name': col_name, 'type': 'VARCHAR' if data_type.startswith('ENUM(') else data_type}
                 for col_name, data_type in columns_result
             ]            
             return columns            
@@ -0,0 +1,153 @@
+import io
+import time
+import zipfile
+
+import pandas as pd
+import pytest
+
+from batch_runner import BatchRunner
+from data_loader import DataLoader
+
+
+class StubAgent:
+    def __init__(self, answers, delay=0.0):
+        self.answers = answers
+        self.delay = delay
+        self.calls = []
+
+    def generate_sql(self, question, schema):
+        self.calls.append(question)
+        time.sleep(self.delay)
+        answer = self.answers.get(question, "ERROR: Insufficient schema")
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture
+def conn(tmp_path):
+    path = tmp_path / "sales.csv"
+    path.write_text("region,amount\nNorth,10\nSouth,20\nNorth,30\n")
+    loader = DataLoader()
+    loader.load_csv(str(path), 'sales')
+    return loader.get_connection()
+
+
+ANSWERS = {
+    'Sales by region': "SELECT region, SUM(amount) AS total FROM sales GROUP BY region ORDER BY region;",
+    'Total per region': "SELECT region, SUM(amount) AS total FROM sales GROUP BY region ORDER BY region",
+    'Row count': "SELECT COUNT(*) AS n FROM sales",
+    'Missing table': "SELECT * FROM nope",
+    'Drop it': "DROP TABLE sales",
+    'Broken': RuntimeError("rate limited"),
+}
+
+
+def run(conn, questions, **kwargs):
+    runner = BatchRunner(conn, StubAgent(ANSWERS, **kwargs), max_workers=4)
+    return runner, runner.run(questions, "schema")
+
+
+def test_parse_txt_keeps_hash_questions():
+    questions = BatchRunner.parse_questions(b"# of orders per month\n\n  Top 5 customers  \n", "q.txt")
+    assert questions == ['# of orders per month', 'Top 5 customers']
+
+
+def test_parse_headerless_csv_keeps_first_question():
+    questions = BatchRunner.parse_questions(b"Total sales by region\nTop 5 customers\n", "q.csv")
+    assert questions == ['Total sales by region', 'Top 5 customers']
+
+
+def test_parse_csv_with_question_header():
+    content = b"id,Question\n1,Total sales by region\n2,Top 5 customers\n"
+    assert BatchRunner.parse_questions(content, "q.csv") == ['Total sales by region', 'Top 5 customers']
+
+
+def test_parse_headerless_csv_with_commas():
+    content = b"What is the total, by region?\nTop 5 customers\nWhich region, if any, grew?\n"
+    assert BatchRunner.parse_questions(content, "q.csv") == [
+        'What is the total, by region?', 'Top 5 customers', 'Which region, if any, grew?'
+    ]
+
+
+def test_parse_quoted_csv_questions():
+    content = b'"What is the total, by region?"\n"Top 5 customers"\n'
+    assert BatchRunner.parse_questions(content, "q.csv") == ['What is the total, by region?', 'Top 5 customers']
+
+
+def test_parse_csv_with_unrecognised_header_is_rejected():
+    with pytest.raises(ValueError, match="question column"):
+        BatchRunner.parse_questions(b"id,text\n1,Total sales by region\n2,Top 5 customers\n", "q.csv")
+
+
+def test_parse_rejects_unknown_format_and_too_many_questions():
+    with pytest.raises(ValueError):
+        BatchRunner.parse_questions(b"x", "q.json")
+    content = "\n".join(f"q{i}" for i in range(BatchRunner.MAX_QUESTIONS + 1)).encode()
+    with pytest.raises(ValueError):
+        BatchRunner.parse_questions(content, "q.txt")
+
+
+def test_identical_sql_runs_once(conn):
+    _, results = run(conn, ['Sales by region', 'Total per region', 'Row count'])
+    first, duplicate, other = results
+    assert first['success'] and duplicate['success'] and other['success']
+    assert duplicate['duplicate_of'] == 1
+    assert duplicate['execution_time'] == 0.0
+    assert duplicate['result'].equals(first['result'])
+    assert first['result']['total'].tolist() == [40, 20]
+    assert other['duplicate_of'] is None
+
+
+def test_failures_are_reported_per_question(conn):
+    _, results = run(conn, ['Missing table', 'Drop it', 'Broken', 'Unknown'])
+    assert not any(r['success'] for r in results)
+    assert results[0]['message'].startswith('Table not found')
+    assert results[1]['message'].startswith('SQL Validation Failed')
+    assert 'rate limited' in results[2]['message']
+    assert results[3]['message'] == 'ERROR: Insufficient schema'
+
+
+def test_generation_is_parallel_and_timed(conn):
+    questions = ['Sales by region', 'Row count', 'Missing table', 'Unknown']
+    start = time.perf_counter()
+    runner, results = run(conn, questions, delay=0.2)
+    assert time.perf_counter() - start < 0.6
+    assert all(r['generation_time'] >= 0.2 for r in results)
+    summary = runner.summarize(results)
+    assert summary['index'].tolist() == [1, 2, 3, 4]
+    assert summary['rows'].tolist() == [2, 1, 0, 0]
+    assert {'generation_seconds', 'execution_seconds', 'duplicate_of'} <= set(summary.columns)
+
+
+def test_excel_export(conn):
+    runner, results = run(conn, ['Sales by region', 'Total per region', 'Missing table'])
+    workbook = pd.ExcelFile(io.BytesIO(runner.to_excel_bytes(results)))
+    assert workbook.sheet_names == ['summary', 'q001_sales_by_region', 'q002_total_per_region']
+    summary = workbook.parse('summary')
+    assert summary['question'].tolist() == ['Sales by region', 'Total per region', 'Missing table']
+    assert workbook.parse('q001_sales_by_region')['total'].tolist() == [40, 20]
+
+
+def test_excel_export_handles_timezones_control_characters_and_large_results(conn, monkeypatch):
+    monkeypatch.setattr(BatchRunner, 'EXCEL_MAX_ROWS', 2)
+    results = [
+        {'index': 1, 'question': 'Timezones', 'sql': '', 'success': True, 'message': '',
+         'result': pd.DataFrame({'ts': pd.to_datetime(['2024-01-01 10:00'] * 3).tz_localize('UTC'),
+                                 'text': ['ok', 'bell\x07', 'tab\tkept']}),
+         'generation_time': 0.0, 'execution_time': 0.0, 'duplicate_of': None},
+    ]
+    workbook = pd.ExcelFile(io.BytesIO(BatchRunner.to_excel_bytes(results)))
+    sheet = workbook.parse('q001_timezones')
+    assert len(sheet) == 2
+    assert sheet['text'].tolist() == ['ok', 'bell']
+    assert workbook.parse('summary')['export_note'].tolist() == ['Truncated to 2 of 3 rows']
+
+
+def test_parquet_export(conn, tmp_path):
+    runner, results = run(conn, ['Sales by region', 'Row count', 'Missing table'])
+    archive = zipfile.ZipFile(io.BytesIO(runner.to_parquet_zip_bytes(results)))
+    assert sorted(archive.namelist()) == ['q001_sales_by_region.parquet', 'q002_row_count.parquet', 'summary.parquet']
+    archive.extractall(tmp_path)
+    result = conn.execute("SELECT * FROM read_parquet(?)", [str(tmp_path / 'q001_sales_by_region.parquet')]).df()
+    assert result['total'].tolist() == [40, 20]
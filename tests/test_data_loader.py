@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_loader import DataLoader
+
+
+def column_types(loader, table_name):
+    rows = loader.get_connection().execute(
+        f"SELECT column_name, data_type FROM information_schema.columns WHERE table_name = '{table_name}'"
+    ).fetchall()
+    return dict(rows)
+
+
+def load_csv(tmp_path, text, **kwargs):
+    path = tmp_path / "data.csv"
+    path.write_text(text)
+    loader = DataLoader(**kwargs)
+    table_name, success, message = loader.load_csv(str(path))
+    assert success, message
+    return loader, table_name
+
+
+@pytest.fixture
+def sales_csv():
+    rows = ["id,region,order_date,created_at,amount,qty,note"]
+    for i in range(1, 21):
+        region = "North" if i % 2 else "South"
+        rows.append(f"{i},{region},2024-01-{i:02d},2024-01-{i:02d} 10:{i:02d}:00,{i * 1.5},{float(i)},note number {i}")
+    return "\n".join(rows) + "\n"
+
+
+def test_dates_become_date_and_timestamp(tmp_path, sales_csv):
+    loader, table = load_csv(tmp_path, sales_csv)
+    types = column_types(loader, table)
+    assert types['order_date'] == 'DATE'
+    assert types['created_at'] == 'TIMESTAMP'
+
+
+def test_dotted_versions_are_not_parsed_as_dates(tmp_path):
+    loader, table = load_csv(tmp_path, "version\n10.1.1\n10.1.2\n10.1.3\n10.1.4\n")
+    assert column_types(loader, table)['version'] == 'VARCHAR'
+    values = loader.get_connection().execute(f"SELECT version FROM {table} ORDER BY 1").fetchall()
+    assert values[0] == ('10.1.1',)
+
+
+def test_low_cardinality_text_becomes_enum(tmp_path, sales_csv):
+    loader, table = load_csv(tmp_path, sales_csv)
+    types = column_types(loader, table)
+    assert types['region'].startswith('ENUM(')
+    assert types['note'] == 'VARCHAR'
+    result = loader.get_connection().execute(
+        f"SELECT region, COUNT(*) FROM {table} GROUP BY region ORDER BY region"
+    ).fetchall()
+    assert result == [('North', 10), ('South', 10)]
+
+
+def test_numeric_columns_keep_their_width(tmp_path):
+    loader, table = load_csv(tmp_path, "qty,whole\n46340,1.0\n2,2.0\n")
+    types = column_types(loader, table)
+    assert types['qty'] == 'BIGINT'
+    assert types['whole'] == 'DOUBLE'
+    conn = loader.get_connection()
+    assert conn.execute(f"SELECT MAX(qty * qty * 2) FROM {table}").fetchone()[0] == 46340 * 46340 * 2
+    assert conn.execute(f"SELECT MAX(qty + 2147483647) FROM {table}").fetchone()[0] == 46340 + 2147483647
+
+
+def test_nullable_integers_load(tmp_path):
+    loader = DataLoader()
+    df = pd.DataFrame({'value': pd.array([1, None, 3], dtype='Int64')})
+    loader._create_table('nullable', df)
+    values = loader.get_connection().execute("SELECT value FROM nullable ORDER BY rowid").fetchall()
+    assert values == [(1,), (None,), (3,)]
+
+
+def test_non_finite_floats_load(tmp_path):
+    loader, table = load_csv(tmp_path, "with_inf,with_nan\n1.0,1.0\ninf,\n3.0,3.0\n")
+    types = column_types(loader, table)
+    assert types['with_inf'] == 'DOUBLE'
+    assert types['with_nan'] == 'DOUBLE'
+    values = loader.get_connection().execute(f"SELECT with_inf, with_nan FROM {table} ORDER BY rowid").fetchall()
+    assert values[1][0] == np.inf
+    assert values[1][1] is None
+
+
+def test_report_numbers(tmp_path, sales_csv):
+    loader, table = load_csv(tmp_path, sales_csv)
+    report = loader.get_optimization_report(table)
+    assert report['rows'] == 20
+    assert set(report['conversions']) == {'region', 'order_date', 'created_at'}
+    assert report['conversions']['order_date'] == 'VARCHAR -> DATE'
+    assert report['bytes_saved'] == report['original_bytes'] - report['optimized_bytes']
+    assert report['bytes_saved'] > 0
+    assert report['percent_saved'] == pytest.approx(report['bytes_saved'] / report['original_bytes'] * 100)
+
+
+def test_optimization_can_be_disabled(tmp_path, sales_csv):
+    loader, table = load_csv(tmp_path, sales_csv, optimize_types=False)
+    assert loader.get_optimization_report(table) is None
+    types = column_types(loader, table)
+    assert types['id'] == 'BIGINT'
+    assert types['region'] == 'VARCHAR'
+
+
+def test_optimization_failure_keeps_original_column(tmp_path, sales_csv, monkeypatch):
+    original_plan = DataLoader._plan_column
+
+    def failing_plan(self, table_name, quoted, col_type, row_count):
+        if quoted == '"region"':
+            raise RuntimeError("boom")
+        return original_plan(self, table_name, quoted, col_type, row_count)
+
+    monkeypatch.setattr(DataLoader, '_plan_column', failing_plan)
+    loader, table = load_csv(tmp_path, sales_csv)
+    types = column_types(loader, table)
+    assert types['region'] == 'VARCHAR'
+    assert types['order_date'] == 'DATE'
+    assert 'region' not in loader.get_optimization_report(table)['conversions']
@@ -0,0 +1,23 @@
+from data_loader import DataLoader
+from schema_extractor import SchemaExtractor
+
+
+def test_prompt_contains_no_cell_values(tmp_path):
+    rows = ["customer_name,ssn,region"]
+    people = [("Alice Smith", "111-22-3333"), ("Bob Jones", "444-55-6666"), ("Carol White", "777-88-9999")]
+    for i in range(30):
+        name, ssn = people[i % 3]
+        rows.append(f"{name},{ssn},{'North' if i % 2 else 'South'}")
+    path = tmp_path / "customers.csv"
+    path.write_text("\n".join(rows) + "\n")
+    loader = DataLoader()
+    loader.load_csv(str(path))
+    assert loader.get_optimization_report('customers')['conversions']['ssn'] == 'VARCHAR -> ENUM'
+
+    extractor = SchemaExtractor(loader.get_connection())
+    prompt = extractor.format_schema_for_prompt()
+    for name, ssn in people:
+        assert name not in prompt
+        assert ssn not in prompt
+    assert 'North' not in prompt
+    assert '- ssn (VARCHAR)' in prompt